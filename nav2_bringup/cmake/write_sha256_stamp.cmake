@@ -0,0 +1,27 @@
+# Copyright (c) 2026 Open Navigation LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+#
+# Write the SHA-256 of every file listed in FILES_LIST, one path per line,
+# to STAMP in the format of sha256sum
+#
+# Usage: cmake -DFILES_LIST=<list file> -DSTAMP=<stamp file> -P write_sha256_stamp.cmake
+#
+file(STRINGS ${FILES_LIST} files)
+set(stamp_content "")
+foreach(file IN LISTS files)
+  file(SHA256 ${file} hash)
+  string(APPEND stamp_content "${hash}  ${file}\n")
+endforeach()
+file(WRITE ${STAMP} "${stamp_content}")
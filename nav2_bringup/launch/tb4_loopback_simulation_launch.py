@@ -14,111 +14,105 @@
 
 """This is all-in-one launch script intended for use by nav2 developers."""
 
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
 import os
+from typing import Optional, TYPE_CHECKING
 
-from ament_index_python.packages import get_package_share_directory
-from launch import LaunchDescription
-from launch.actions import DeclareLaunchArgument, GroupAction, IncludeLaunchDescription
-from launch.conditions import IfCondition
-from launch.launch_description_sources import PythonLaunchDescriptionSource
-from launch.substitutions import Command, LaunchConfiguration
-from launch_ros.actions import Node, SetParameter
-from launch_ros.descriptions import ParameterFile
-from nav2_common.launch import LaunchConfigAsBool, RewrittenYaml
+if TYPE_CHECKING:
+    from launch import LaunchDescription
 
 
-def generate_launch_description() -> LaunchDescription:
-    # Get the launch directory
+@lru_cache(maxsize=None)
+def _paths() -> dict[str, str]:
+    """Resolve the package directories and default file paths once, when first needed."""
+    from ament_index_python.packages import get_package_share_directory
+
     bringup_dir = get_package_share_directory('nav2_bringup')
-    loopback_sim_dir = get_package_share_directory('nav2_loopback_sim')
-    launch_dir = os.path.join(bringup_dir, 'launch')
     desc_dir = get_package_share_directory('nav2_minimal_tb4_description')
+    return {
+        'launch_dir': os.path.join(bringup_dir, 'launch'),
+        'loopback_sim_dir': get_package_share_directory('nav2_loopback_sim'),
+        # Defaults of the file path launch arguments
+        'map': os.path.join(bringup_dir, 'maps', 'depot.yaml'),  # Try warehouse.yaml!
+        'graph': os.path.join(bringup_dir, 'graphs', 'depot_graph.geojson'),
+        'params_file': os.path.join(bringup_dir, 'params', 'nav2_params.yaml'),
+        'rviz_config_file': os.path.join(bringup_dir, 'rviz', 'nav2_default_view.rviz'),
+        'robot_sdf': os.path.join(desc_dir, 'urdf', 'standard', 'turtlebot4.urdf.xacro'),
+        'robot_urdf': os.path.join(bringup_dir, 'urdf', 'turtlebot4.urdf'),
+    }
+
+
+# Launch arguments as (name, default value, description), in declaration order. A default of
+# None stands for the path of the same name resolved by _paths().
+_LAUNCH_ARGS: tuple[tuple[str, Optional[str], str], ...] = (
+    ('namespace', '', 'Top-level namespace'),
+    ('map', None, 'Full path to map file to load'),
+    ('graph', None, 'Full path to the route graph file to load'),
+    ('params_file', None,
+     'Full path to the ROS2 parameters file to use for all launched nodes'),
+    ('autostart', 'true', 'Automatically startup the nav2 stack'),
+    ('use_composition', 'True', 'Whether to use composed bringup'),
+    ('rviz_config_file', None, 'Full path to the RVIZ config file to use'),
+    ('use_robot_state_pub', 'True', 'Whether to start the robot state publisher'),
+    ('use_rviz', 'True', 'Whether to start RVIZ'),
+    ('use_respawn', 'False',
+     'Whether to respawn if a node crashes. Applied when composition is disabled.'),
+)
+
+# Arguments forwarded to bringup_launch.py from the matching launch configurations
+_BRINGUP_ARG_NAMES = (
+    'namespace', 'map', 'graph', 'params_file', 'autostart', 'use_composition', 'use_respawn',
+)
+# Arguments of bringup_launch.py that are fixed for the loopback simulation
+_BRINGUP_FIXED_ARGS = (
+    ('use_sim_time', 'True'),
+    ('use_keepout_zones', 'False'),  # Keepout zones not used in loopback simulation
+    ('use_speed_zones', 'False'),  # Speed zones not used in loopback simulation
+    ('use_localization', 'False'),  # Don't use SLAM, AMCL
+)
+
+
+def generate_launch_description() -> 'LaunchDescription':
+    # The launch modules are imported here rather than at the top of the file so that
+    # tools which only import this file do not pay for loading them
+    from launch import Action, LaunchContext, LaunchDescription
+    from launch.actions import (DeclareLaunchArgument, GroupAction, IncludeLaunchDescription,
+                                OpaqueFunction)
+    from launch.conditions import IfCondition
+    from launch.launch_description_sources import PythonLaunchDescriptionSource
+    from launch.substitutions import LaunchConfiguration
+    from launch_ros.actions import Node, SetParameter
+    from launch_ros.descriptions import ParameterFile
+    from nav2_common.launch import (launch_config_as_bool, load_robot_description,
+                                    namespaced_params_file)
+
+    paths = _paths()
+    launch_dir = paths['launch_dir']
 
     # Create the launch configuration variables
     namespace = LaunchConfiguration('namespace')
     map_yaml_file = LaunchConfiguration('map')
     graph_filepath = LaunchConfiguration('graph')
     params_file = LaunchConfiguration('params_file')
-    autostart = LaunchConfigAsBool('autostart')
-    use_composition = LaunchConfigAsBool('use_composition')
-    use_respawn = LaunchConfigAsBool('use_respawn')
+    autostart = launch_config_as_bool('autostart')
+    use_composition = launch_config_as_bool('use_composition')
+    use_respawn = launch_config_as_bool('use_respawn')
 
     # Launch configuration variables specific to simulation
     rviz_config_file = LaunchConfiguration('rviz_config_file')
-    use_robot_state_pub = LaunchConfigAsBool('use_robot_state_pub')
-    use_rviz = LaunchConfigAsBool('use_rviz')
+    use_robot_state_pub = launch_config_as_bool('use_robot_state_pub')
+    use_rviz = launch_config_as_bool('use_rviz')
 
     remappings = [('/tf', 'tf'), ('/tf_static', 'tf_static')]
 
     # Declare the launch arguments
-    declare_namespace_cmd = DeclareLaunchArgument(
-        'namespace', default_value='', description='Top-level namespace'
-    )
-
-    declare_map_yaml_cmd = DeclareLaunchArgument(
-        'map',
-        default_value=os.path.join(bringup_dir, 'maps', 'depot.yaml'),  # Try warehouse.yaml!
-        description='Full path to map file to load',
-    )
-
-    declare_graph_file_cmd = DeclareLaunchArgument(
-        'graph',
-        default_value=os.path.join(bringup_dir, 'graphs', 'depot_graph.geojson'),
-    )
-
-    declare_params_file_cmd = DeclareLaunchArgument(
-        'params_file',
-        default_value=os.path.join(bringup_dir, 'params', 'nav2_params.yaml'),
-        description='Full path to the ROS2 parameters file to use for all launched nodes',
-    )
-
-    declare_autostart_cmd = DeclareLaunchArgument(
-        'autostart',
-        default_value='true',
-        description='Automatically startup the nav2 stack',
-    )
-
-    declare_use_composition_cmd = DeclareLaunchArgument(
-        'use_composition',
-        default_value='True',
-        description='Whether to use composed bringup',
-    )
-
-    declare_use_respawn_cmd = DeclareLaunchArgument(
-        'use_respawn',
-        default_value='False',
-        description='Whether to respawn if a node crashes. Applied when composition is disabled.',
-    )
-
-    declare_rviz_config_file_cmd = DeclareLaunchArgument(
-        'rviz_config_file',
-        default_value=os.path.join(bringup_dir, 'rviz', 'nav2_default_view.rviz'),
-        description='Full path to the RVIZ config file to use',
-    )
-
-    declare_use_robot_state_pub_cmd = DeclareLaunchArgument(
-        'use_robot_state_pub',
-        default_value='True',
-        description='Whether to start the robot state publisher',
-    )
-
-    declare_use_rviz_cmd = DeclareLaunchArgument(
-        'use_rviz', default_value='True', description='Whether to start RVIZ'
-    )
-
-    sdf = os.path.join(desc_dir, 'urdf', 'standard', 'turtlebot4.urdf.xacro')
-    start_robot_state_publisher_cmd = Node(
-        condition=IfCondition(use_robot_state_pub),
-        package='robot_state_publisher',
-        executable='robot_state_publisher',
-        name='robot_state_publisher',
-        namespace=namespace,
-        output='screen',
-        parameters=[
-            {'use_sim_time': True, 'robot_description': Command(['xacro', ' ', sdf])}
-        ],
-        remappings=remappings,
-    )
+    declare_launch_args = [
+        DeclareLaunchArgument(
+            name, default_value=paths[name] if default_value is None else default_value,
+            description=description)
+        for name, default_value, description in _LAUNCH_ARGS
+    ]
 
     rviz_cmd = IncludeLaunchDescription(
         PythonLaunchDescriptionSource(os.path.join(launch_dir, 'rviz_launch.py')),
@@ -132,24 +126,14 @@ def generate_launch_description() -> LaunchDescription:
 
     bringup_cmd = IncludeLaunchDescription(
         PythonLaunchDescriptionSource(os.path.join(launch_dir, 'bringup_launch.py')),
-        launch_arguments={
-            'namespace': namespace,
-            'map': map_yaml_file,
-            'graph': graph_filepath,
-            'use_sim_time': 'True',
-            'params_file': params_file,
-            'autostart': autostart,
-            'use_composition': use_composition,
-            'use_respawn': use_respawn,
-            'use_keepout_zones': 'False',  # Keepout zones not used in loopback simulation
-            'use_speed_zones': 'False',  # Speed zones not used in loopback simulation
-            'use_localization': 'False',  # Don't use SLAM, AMCL
-        }.items(),
+        launch_arguments=tuple(zip(_BRINGUP_ARG_NAMES, (
+            namespace, map_yaml_file, graph_filepath, params_file, autostart, use_composition,
+            use_respawn))) + _BRINGUP_FIXED_ARGS,
     )
 
     loopback_sim_cmd = IncludeLaunchDescription(
         PythonLaunchDescriptionSource(
-            os.path.join(loopback_sim_dir, 'loopback_simulation.launch.py')),
+            os.path.join(paths['loopback_sim_dir'], 'loopback_simulation.launch.py')),
         launch_arguments=[
             ('params_file', params_file),
             ('scan_frame_id', 'rplidar_link'),
@@ -165,63 +149,69 @@ def generate_launch_description() -> LaunchDescription:
             '--frame-id', 'base_footprint', '--child-frame-id', 'base_link']
     )
 
-    configured_params = ParameterFile(
-        RewrittenYaml(
-            source_file=params_file,
-            root_key=namespace,
-            param_rewrites={},
-            convert_types=True,
-        ),
-        allow_substs=True,
-    )
-
-    start_map_server = GroupAction(
-        actions=[
-            SetParameter('use_sim_time', True),
-            Node(
-                package='nav2_map_server',
-                executable='map_server',
-                name='map_server',
-                output='screen',
-                respawn=use_respawn,
-                respawn_delay=2.0,
-                parameters=[configured_params, {'yaml_filename': map_yaml_file}],
-                remappings=remappings,
-            ),
-            Node(
-                package='nav2_lifecycle_manager',
-                executable='lifecycle_manager',
-                name='lifecycle_manager_map_server',
+    def preprocess_and_start_nodes(context: LaunchContext) -> list[Action]:
+        # The robot xacro expansion and the params rewrite are independent, so they are
+        # overlapped. Expanding xacro in-process avoids spawning the xacro CLI.
+        robot_description: Optional[Future[str]] = None
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            params_path = executor.submit(
+                namespaced_params_file, params_file.perform(context), namespace.perform(context))
+            if IfCondition(use_robot_state_pub).evaluate(context):
+                robot_description = executor.submit(
+                    load_robot_description, paths['robot_sdf'], paths['robot_urdf'])
+            configured_params = ParameterFile(params_path.result(), allow_substs=True)
+
+        actions: list[Action] = []
+        if robot_description is not None:
+            actions.append(Node(
+                package='robot_state_publisher',
+                executable='robot_state_publisher',
+                name='robot_state_publisher',
+                namespace=namespace,
                 output='screen',
                 parameters=[
-                    configured_params,
-                    {'autostart': autostart}, {'node_names': ['map_server']}],
-            ),
-        ]
-    )
-
-    # Create the launch description and populate
-    ld = LaunchDescription()
-
-    # Declare the launch options
-    ld.add_action(declare_namespace_cmd)
-    ld.add_action(declare_map_yaml_cmd)
-    ld.add_action(declare_graph_file_cmd)
-    ld.add_action(declare_params_file_cmd)
-    ld.add_action(declare_autostart_cmd)
-    ld.add_action(declare_use_composition_cmd)
-
-    ld.add_action(declare_rviz_config_file_cmd)
-    ld.add_action(declare_use_robot_state_pub_cmd)
-    ld.add_action(declare_use_rviz_cmd)
-    ld.add_action(declare_use_respawn_cmd)
-
-    # Add the actions to launch all of the navigation nodes
-    ld.add_action(start_robot_state_publisher_cmd)
-    ld.add_action(static_publisher_cmd)
-    ld.add_action(start_map_server)
-    ld.add_action(loopback_sim_cmd)
-    ld.add_action(rviz_cmd)
-    ld.add_action(bringup_cmd)
-
-    return ld
+                    {'use_sim_time': True, 'robot_description': robot_description.result()}
+                ],
+                remappings=remappings,
+            ))
+
+        actions.append(GroupAction(
+            actions=[
+                SetParameter('use_sim_time', True),
+                Node(
+                    package='nav2_map_server',
+                    executable='map_server',
+                    name='map_server',
+                    output='screen',
+                    respawn=use_respawn,
+                    respawn_delay=2.0,
+                    parameters=[configured_params, {'yaml_filename': map_yaml_file}],
+                    remappings=remappings,
+                ),
+                Node(
+                    package='nav2_lifecycle_manager',
+                    executable='lifecycle_manager',
+                    name='lifecycle_manager_map_server',
+                    output='screen',
+                    parameters=[
+                        configured_params,
+                        {'autostart': autostart}, {'node_names': ['map_server']}],
+                ),
+            ]
+        ))
+        return actions
+
+    preprocess_and_start_nodes_cmd = OpaqueFunction(function=preprocess_and_start_nodes)
+
+    # Create the launch description with all of the actions at once
+    return LaunchDescription([
+        # Declare the launch options
+        *declare_launch_args,
+
+        # Add the actions to launch all of the navigation nodes
+        preprocess_and_start_nodes_cmd,
+        static_publisher_cmd,
+        loopback_sim_cmd,
+        rviz_cmd,
+        bringup_cmd,
+    ])
@@ -14,19 +14,14 @@
 
 """This is all-in-one launch script intended for use by nav2 developers."""
 
+from contextlib import suppress
+from functools import lru_cache, partial
 import os
 import tempfile
+from typing import Optional, TYPE_CHECKING
 
-from ament_index_python.packages import get_package_share_directory
-from launch import LaunchDescription
-from launch.actions import (AppendEnvironmentVariable, DeclareLaunchArgument, ExecuteProcess,
-                            IncludeLaunchDescription, OpaqueFunction, RegisterEventHandler)
-from launch.conditions import IfCondition
-from launch.event_handlers import OnShutdown
-from launch.launch_description_sources import PythonLaunchDescriptionSource
-from launch.substitutions import Command, LaunchConfiguration, PythonExpression
-from launch_ros.actions import Node
-from nav2_common.launch import LaunchConfigAsBool
+if TYPE_CHECKING:
+    from launch import LaunchContext, LaunchDescription
 
 # Define local map types
 MAP_POSES_DICT = {
@@ -41,45 +36,153 @@ MAP_POSES_DICT = {
 }
 MAP_TYPE = 'depot'  # Change this to 'warehouse' for warehouse map
 
+# Default spawn pose of the robot in the selected map
+_DEFAULT_POSE = MAP_POSES_DICT[MAP_TYPE]
+_X_POSE_DEFAULT, _Y_POSE_DEFAULT, _Z_POSE_DEFAULT = (
+    _DEFAULT_POSE['x'], _DEFAULT_POSE['y'], _DEFAULT_POSE['z'])
+_ROLL_DEFAULT, _PITCH_DEFAULT, _YAW_DEFAULT = (
+    _DEFAULT_POSE['R'], _DEFAULT_POSE['P'], _DEFAULT_POSE['Y'])
+
+
+@lru_cache(maxsize=None)
+def _paths() -> dict[str, str]:
+    """Resolve the package directories and default file paths once, when first needed."""
+    from ament_index_python.packages import get_package_share_directory
 
-def generate_launch_description() -> LaunchDescription:
-    # Get the launch directory
     bringup_dir = get_package_share_directory('nav2_bringup')
-    launch_dir = os.path.join(bringup_dir, 'launch')
     # This checks that tb4 exists needed for the URDF / simulation files.
     # If not using TB4, its safe to remove.
     sim_dir = get_package_share_directory('nav2_minimal_tb4_sim')
     desc_dir = get_package_share_directory('nav2_minimal_tb4_description')
+    return {
+        'launch_dir': os.path.join(bringup_dir, 'launch'),
+        'sim_dir': sim_dir,
+        'ros_gz_sim_dir': get_package_share_directory('ros_gz_sim'),
+        # Defaults of the file path launch arguments, which only depend on MAP_TYPE
+        'map': os.path.join(bringup_dir, 'maps', f'{MAP_TYPE}.yaml'),
+        'keepout_mask': os.path.join(bringup_dir, 'maps', f'{MAP_TYPE}_keepout.yaml'),
+        'speed_mask': os.path.join(bringup_dir, 'maps', f'{MAP_TYPE}_speed.yaml'),
+        'graph': os.path.join(bringup_dir, 'graphs', f'{MAP_TYPE}_graph.geojson'),
+        'params_file': os.path.join(bringup_dir, 'params', 'nav2_params.yaml'),
+        'rviz_config_file': os.path.join(bringup_dir, 'rviz', 'nav2_default_view.rviz'),
+        'world': os.path.join(sim_dir, 'worlds', f'{MAP_TYPE}.sdf'),
+        'robot_sdf': os.path.join(desc_dir, 'urdf', 'standard', 'turtlebot4.urdf.xacro'),
+        'robot_urdf': os.path.join(bringup_dir, 'urdf', 'turtlebot4.urdf'),
+    }
+
+
+# Launch arguments as (name, default value, description), in declaration order. A default of
+# None stands for the path of the same name resolved by _paths().
+_LAUNCH_ARGS: tuple[tuple[str, Optional[str], str], ...] = (
+    ('namespace', '', 'Top-level namespace'),
+    ('slam', 'False', 'Whether run a SLAM'),
+    ('map', None, 'Full path to map file to load'),
+    ('keepout_mask', None, 'Full path to keepout mask file to load'),
+    ('speed_mask', None, 'Full path to speed mask file to load'),
+    ('graph', None, 'Full path to the route graph file to load'),
+    ('use_sim_time', 'true', 'Use simulation (Gazebo) clock if true'),
+    ('params_file', None,
+     'Full path to the ROS2 parameters file to use for all launched nodes'),
+    ('autostart', 'true', 'Automatically startup the nav2 stack'),
+    ('use_composition', 'True', 'Whether to use composed bringup'),
+    ('rviz_config_file', None, 'Full path to the RVIZ config file to use'),
+    ('use_simulator', 'True', 'Whether to start the simulator'),
+    ('use_robot_state_pub', 'True', 'Whether to start the robot state publisher'),
+    ('use_rviz', 'True', 'Whether to start RVIZ'),
+    ('headless', 'True', 'Whether to execute gzclient)'),
+    ('world', None, 'Full path to world model file to load'),
+    ('robot_name', 'nav2_turtlebot4', 'name of the robot'),
+    ('robot_sdf', None, 'Full path to robot sdf file to spawn the robot in gazebo'),
+    ('use_respawn', 'False',
+     'Whether to respawn if a node crashes. Applied when composition is disabled.'),
+    ('use_keepout_zones', 'True', 'Whether to enable keepout zones or not'),
+    ('use_speed_zones', 'True', 'Whether to enable speed zones or not'),
+)
+
+# Arguments forwarded to bringup_launch.py from the matching launch configurations
+_BRINGUP_ARG_NAMES = (
+    'namespace', 'slam', 'map', 'keepout_mask', 'speed_mask', 'graph', 'use_sim_time',
+    'params_file', 'autostart', 'use_composition', 'use_respawn', 'use_keepout_zones',
+    'use_speed_zones',
+)
+
+
+def _unlink_tmp(path: str, _context: 'LaunchContext') -> None:
+    """Remove a temporary file, tolerating it having been removed already."""
+    with suppress(FileNotFoundError):
+        os.unlink(path)
+
+
+# The SDF file for the world is a xacro file because we wanted to
+# conditionally load the SceneBroadcaster plugin based on whether we're
+# running in headless mode. But currently, the Gazebo command line doesn't
+# take SDF strings for worlds, so the output of xacro needs to be saved into
+# a temporary file and passed to Gazebo.
+def _write_world_sdf(world_path: str, mappings: frozenset[tuple[str, str]]) -> str:
+    """Expand the world xacro into a new temporary SDF file and return its path."""
+    from nav2_common.launch import process_xacro
+
+    world_xml = process_xacro(world_path, mappings).encode()
+    # Prefer tmpfs so the expanded world never has to hit the disk
+    world_sdf_fd, world_sdf = tempfile.mkstemp(
+        prefix='nav2_', suffix='.sdf',
+        dir='/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir())
+    try:
+        # Write the expanded world with a single write through a 1 MiB buffer
+        with open(world_sdf_fd, 'wb', buffering=1 << 20) as f:
+            f.write(world_xml)
+    except BaseException:
+        os.unlink(world_sdf)
+        raise
+    return world_sdf
+
+
+def generate_launch_description() -> 'LaunchDescription':
+    # The launch modules are imported here rather than at the top of the file so that
+    # tools which only import this file do not pay for loading them
+    from launch import Action, LaunchContext, LaunchDescription
+    from launch.actions import (DeclareLaunchArgument, ExecuteProcess, IncludeLaunchDescription,
+                                OpaqueFunction, RegisterEventHandler)
+    from launch.conditions import IfCondition
+    from launch.event_handlers import OnShutdown
+    from launch.launch_description_sources import PythonLaunchDescriptionSource
+    from launch.substitutions import LaunchConfiguration, PythonExpression
+    from launch_ros.actions import Node
+    from nav2_common.launch import append_env_path, launch_config_as_bool, load_robot_description
+
+    paths = _paths()
+    launch_dir = paths['launch_dir']
+    sim_dir = paths['sim_dir']
 
     # Create the launch configuration variables
-    slam = LaunchConfigAsBool('slam')
+    slam = launch_config_as_bool('slam')
     namespace = LaunchConfiguration('namespace')
     map_yaml_file = LaunchConfiguration('map')
     keepout_mask_yaml_file = LaunchConfiguration('keepout_mask')
     speed_mask_yaml_file = LaunchConfiguration('speed_mask')
     graph_filepath = LaunchConfiguration('graph')
-    use_sim_time = LaunchConfigAsBool('use_sim_time')
+    use_sim_time = launch_config_as_bool('use_sim_time')
     params_file = LaunchConfiguration('params_file')
-    autostart = LaunchConfigAsBool('autostart')
-    use_composition = LaunchConfigAsBool('use_composition')
-    use_respawn = LaunchConfigAsBool('use_respawn')
-    use_keepout_zones = LaunchConfigAsBool('use_keepout_zones')
-    use_speed_zones = LaunchConfigAsBool('use_speed_zones')
+    autostart = launch_config_as_bool('autostart')
+    use_composition = launch_config_as_bool('use_composition')
+    use_respawn = launch_config_as_bool('use_respawn')
+    use_keepout_zones = launch_config_as_bool('use_keepout_zones')
+    use_speed_zones = launch_config_as_bool('use_speed_zones')
 
     # Launch configuration variables specific to simulation
     rviz_config_file = LaunchConfiguration('rviz_config_file')
-    use_simulator = LaunchConfigAsBool('use_simulator')
-    use_robot_state_pub = LaunchConfigAsBool('use_robot_state_pub')
-    use_rviz = LaunchConfigAsBool('use_rviz')
-    headless = LaunchConfigAsBool('headless')
+    use_simulator = launch_config_as_bool('use_simulator')
+    use_robot_state_pub = launch_config_as_bool('use_robot_state_pub')
+    use_rviz = launch_config_as_bool('use_rviz')
+    headless = launch_config_as_bool('headless')
     world = LaunchConfiguration('world')
     pose = {
-        'x': LaunchConfiguration('x_pose', default=MAP_POSES_DICT[MAP_TYPE]['x']),
-        'y': LaunchConfiguration('y_pose', default=MAP_POSES_DICT[MAP_TYPE]['y']),
-        'z': LaunchConfiguration('z_pose', default=MAP_POSES_DICT[MAP_TYPE]['z']),
-        'R': LaunchConfiguration('roll', default=MAP_POSES_DICT[MAP_TYPE]['R']),
-        'P': LaunchConfiguration('pitch', default=MAP_POSES_DICT[MAP_TYPE]['P']),
-        'Y': LaunchConfiguration('yaw', default=MAP_POSES_DICT[MAP_TYPE]['Y']),
+        'x': LaunchConfiguration('x_pose', default=_X_POSE_DEFAULT),
+        'y': LaunchConfiguration('y_pose', default=_Y_POSE_DEFAULT),
+        'z': LaunchConfiguration('z_pose', default=_Z_POSE_DEFAULT),
+        'R': LaunchConfiguration('roll', default=_ROLL_DEFAULT),
+        'P': LaunchConfiguration('pitch', default=_PITCH_DEFAULT),
+        'Y': LaunchConfiguration('yaw', default=_YAW_DEFAULT),
     }
     robot_name = LaunchConfiguration('robot_name')
     robot_sdf = LaunchConfiguration('robot_sdf')
@@ -87,131 +190,12 @@ def generate_launch_description() -> LaunchDescription:
     remappings = [('/tf', 'tf'), ('/tf_static', 'tf_static')]
 
     # Declare the launch arguments
-    declare_namespace_cmd = DeclareLaunchArgument(
-        'namespace', default_value='', description='Top-level namespace'
-    )
-
-    declare_slam_cmd = DeclareLaunchArgument(
-        'slam', default_value='False', description='Whether run a SLAM'
-    )
-
-    declare_map_yaml_cmd = DeclareLaunchArgument(
-        'map',
-        default_value=os.path.join(bringup_dir, 'maps', f'{MAP_TYPE}.yaml'),
-        description='Full path to map file to load',
-    )
-
-    declare_keepout_mask_yaml_cmd = DeclareLaunchArgument(
-        'keepout_mask',
-        default_value=os.path.join(bringup_dir, 'maps', f'{MAP_TYPE}_keepout.yaml'),
-        description='Full path to keepout mask file to load',
-    )
-
-    declare_speed_mask_yaml_cmd = DeclareLaunchArgument(
-        'speed_mask',
-        default_value=os.path.join(bringup_dir, 'maps', f'{MAP_TYPE}_speed.yaml'),
-        description='Full path to speed mask file to load',
-    )
-
-    declare_graph_file_cmd = DeclareLaunchArgument(
-        'graph',
-        default_value=os.path.join(bringup_dir, 'graphs', f'{MAP_TYPE}_graph.geojson'),
-    )
-
-    declare_use_sim_time_cmd = DeclareLaunchArgument(
-        'use_sim_time',
-        default_value='true',
-        description='Use simulation (Gazebo) clock if true',
-    )
-
-    declare_params_file_cmd = DeclareLaunchArgument(
-        'params_file',
-        default_value=os.path.join(bringup_dir, 'params', 'nav2_params.yaml'),
-        description='Full path to the ROS2 parameters file to use for all launched nodes',
-    )
-
-    declare_autostart_cmd = DeclareLaunchArgument(
-        'autostart',
-        default_value='true',
-        description='Automatically startup the nav2 stack',
-    )
-
-    declare_use_composition_cmd = DeclareLaunchArgument(
-        'use_composition',
-        default_value='True',
-        description='Whether to use composed bringup',
-    )
-
-    declare_use_respawn_cmd = DeclareLaunchArgument(
-        'use_respawn',
-        default_value='False',
-        description='Whether to respawn if a node crashes. Applied when composition is disabled.',
-    )
-
-    declare_use_keepout_zones_cmd = DeclareLaunchArgument(
-        'use_keepout_zones', default_value='True',
-        description='Whether to enable keepout zones or not'
-    )
-
-    declare_use_speed_zones_cmd = DeclareLaunchArgument(
-        'use_speed_zones', default_value='True',
-        description='Whether to enable speed zones or not'
-    )
-
-    declare_rviz_config_file_cmd = DeclareLaunchArgument(
-        'rviz_config_file',
-        default_value=os.path.join(bringup_dir, 'rviz', 'nav2_default_view.rviz'),
-        description='Full path to the RVIZ config file to use',
-    )
-
-    declare_use_simulator_cmd = DeclareLaunchArgument(
-        'use_simulator',
-        default_value='True',
-        description='Whether to start the simulator',
-    )
-
-    declare_use_robot_state_pub_cmd = DeclareLaunchArgument(
-        'use_robot_state_pub',
-        default_value='True',
-        description='Whether to start the robot state publisher',
-    )
-
-    declare_use_rviz_cmd = DeclareLaunchArgument(
-        'use_rviz', default_value='True', description='Whether to start RVIZ'
-    )
-
-    declare_simulator_cmd = DeclareLaunchArgument(
-        'headless', default_value='True', description='Whether to execute gzclient)'
-    )
-
-    declare_world_cmd = DeclareLaunchArgument(
-        'world',
-        default_value=os.path.join(sim_dir, 'worlds', f'{MAP_TYPE}.sdf'),
-        description='Full path to world model file to load',
-    )
-
-    declare_robot_name_cmd = DeclareLaunchArgument(
-        'robot_name', default_value='nav2_turtlebot4', description='name of the robot'
-    )
-
-    declare_robot_sdf_cmd = DeclareLaunchArgument(
-        'robot_sdf',
-        default_value=os.path.join(desc_dir, 'urdf', 'standard', 'turtlebot4.urdf.xacro'),
-        description='Full path to robot sdf file to spawn the robot in gazebo',
-    )
-
-    start_robot_state_publisher_cmd = Node(
-        condition=IfCondition(use_robot_state_pub),
-        package='robot_state_publisher',
-        executable='robot_state_publisher',
-        name='robot_state_publisher',
-        namespace=namespace,
-        output='screen',
-        parameters=[
-            {'use_sim_time': use_sim_time, 'robot_description': Command(['xacro', ' ', robot_sdf])}
-        ],
-        remappings=remappings,
-    )
+    declare_launch_args = [
+        DeclareLaunchArgument(
+            name, default_value=paths[name] if default_value is None else default_value,
+            description=description)
+        for name, default_value, description in _LAUNCH_ARGS
+    ]
 
     rviz_cmd = IncludeLaunchDescription(
         PythonLaunchDescriptionSource(os.path.join(launch_dir, 'rviz_launch.py')),
@@ -225,48 +209,57 @@ def generate_launch_description() -> LaunchDescription:
 
     bringup_cmd = IncludeLaunchDescription(
         PythonLaunchDescriptionSource(os.path.join(launch_dir, 'bringup_launch.py')),
-        launch_arguments={
-            'namespace': namespace,
-            'slam': slam,
-            'map': map_yaml_file,
-            'keepout_mask': keepout_mask_yaml_file,
-            'speed_mask': speed_mask_yaml_file,
-            'graph': graph_filepath,
-            'use_sim_time': use_sim_time,
-            'params_file': params_file,
-            'autostart': autostart,
-            'use_composition': use_composition,
-            'use_respawn': use_respawn,
-            'use_keepout_zones': use_keepout_zones,
-            'use_speed_zones': use_speed_zones,
-        }.items(),
-    )
-
-    # The SDF file for the world is a xacro file because we wanted to
-    # conditionally load the SceneBroadcaster plugin based on whether we're
-    # running in headless mode. But currently, the Gazebo command line doesn't
-    # take SDF strings for worlds, so the output of xacro needs to be saved into
-    # a temporary file and passed to Gazebo.
-    world_sdf = tempfile.mktemp(prefix='nav2_', suffix='.sdf')
-    world_sdf_xacro = ExecuteProcess(
-        cmd=['xacro', '-o', world_sdf, ['headless:=', headless], world])
-    gazebo_server = ExecuteProcess(
-        cmd=['gz', 'sim', '-r', '-s', world_sdf],
-        output='screen',
-        condition=IfCondition(use_simulator)
+        launch_arguments=tuple(zip(_BRINGUP_ARG_NAMES, (
+            namespace, slam, map_yaml_file, keepout_mask_yaml_file, speed_mask_yaml_file,
+            graph_filepath, use_sim_time, params_file, autostart, use_composition, use_respawn,
+            use_keepout_zones, use_speed_zones))),
     )
 
-    remove_temp_sdf_file = RegisterEventHandler(event_handler=OnShutdown(
-        on_shutdown=[
-            OpaqueFunction(function=lambda _: os.remove(world_sdf))
-        ]))
-
-    set_env_vars_resources = AppendEnvironmentVariable(
-            'GZ_SIM_RESOURCE_PATH',
-            os.path.join(sim_dir, 'worlds'))
+    def start_simulation_and_state_publisher(context: LaunchContext) -> list[Action]:
+        # Expanding xacro in-process avoids spawning a python interpreter for the xacro CLI.
+        # The world file is only created once the launch runs, together with the actions
+        # that use it and remove it again, so describing the launch leaves nothing behind.
+        actions: list[Action] = []
+        if IfCondition(use_simulator).evaluate(context):
+            world_mappings = frozenset({('headless', headless.perform(context))})
+            world_sdf = _write_world_sdf(world.perform(context), world_mappings)
+            actions += [
+                RegisterEventHandler(event_handler=OnShutdown(
+                    on_shutdown=[
+                        OpaqueFunction(function=partial(_unlink_tmp, world_sdf))
+                    ])),
+                ExecuteProcess(
+                    cmd=['gz', 'sim', '-r', '-s', world_sdf],
+                    output='screen',
+                ),
+            ]
+
+        if IfCondition(use_robot_state_pub).evaluate(context):
+            robot_sdf_path = robot_sdf.perform(context)
+            robot_description = load_robot_description(
+                robot_sdf_path,
+                paths['robot_urdf'] if robot_sdf_path == paths['robot_sdf'] else None)
+            actions.append(Node(
+                package='robot_state_publisher',
+                executable='robot_state_publisher',
+                name='robot_state_publisher',
+                namespace=namespace,
+                output='screen',
+                parameters=[
+                    {'use_sim_time': use_sim_time, 'robot_description': robot_description}
+                ],
+                remappings=remappings,
+            ))
+        return actions
+
+    start_simulation_and_state_publisher_cmd = OpaqueFunction(
+        function=start_simulation_and_state_publisher)
+
+    set_env_vars_resources = OpaqueFunction(function=partial(
+        append_env_path, 'GZ_SIM_RESOURCE_PATH', os.path.join(sim_dir, 'worlds')))
     gazebo_client = IncludeLaunchDescription(
         PythonLaunchDescriptionSource(
-            os.path.join(get_package_share_directory('ros_gz_sim'),
+            os.path.join(paths['ros_gz_sim_dir'],
                          'launch',
                          'gz_sim.launch.py')
         ),
@@ -290,43 +283,17 @@ def generate_launch_description() -> LaunchDescription:
                           'pitch': pose['P'],
                           'yaw': pose['Y']}.items())
 
-    # Create the launch description and populate
-    ld = LaunchDescription()
-
-    # Declare the launch options
-    ld.add_action(declare_namespace_cmd)
-    ld.add_action(declare_slam_cmd)
-    ld.add_action(declare_map_yaml_cmd)
-    ld.add_action(declare_keepout_mask_yaml_cmd)
-    ld.add_action(declare_speed_mask_yaml_cmd)
-    ld.add_action(declare_graph_file_cmd)
-    ld.add_action(declare_use_sim_time_cmd)
-    ld.add_action(declare_params_file_cmd)
-    ld.add_action(declare_autostart_cmd)
-    ld.add_action(declare_use_composition_cmd)
-
-    ld.add_action(declare_rviz_config_file_cmd)
-    ld.add_action(declare_use_simulator_cmd)
-    ld.add_action(declare_use_robot_state_pub_cmd)
-    ld.add_action(declare_use_rviz_cmd)
-    ld.add_action(declare_simulator_cmd)
-    ld.add_action(declare_world_cmd)
-    ld.add_action(declare_robot_name_cmd)
-    ld.add_action(declare_robot_sdf_cmd)
-    ld.add_action(declare_use_respawn_cmd)
-    ld.add_action(declare_use_keepout_zones_cmd)
-    ld.add_action(declare_use_speed_zones_cmd)
-
-    ld.add_action(set_env_vars_resources)
-    ld.add_action(world_sdf_xacro)
-    ld.add_action(remove_temp_sdf_file)
-    ld.add_action(gz_robot)
-    ld.add_action(gazebo_server)
-    ld.add_action(gazebo_client)
-
-    # Add the actions to launch all of the navigation nodes
-    ld.add_action(start_robot_state_publisher_cmd)
-    ld.add_action(rviz_cmd)
-    ld.add_action(bringup_cmd)
-
-    return ld
+    # Create the launch description with all of the actions at once
+    return LaunchDescription([
+        # Declare the launch options
+        *declare_launch_args,
+
+        set_env_vars_resources,
+        start_simulation_and_state_publisher_cmd,
+        gz_robot,
+        gazebo_client,
+
+        # Add the actions to launch all of the navigation nodes
+        rviz_cmd,
+        bringup_cmd,
+    ])
@@ -14,12 +14,22 @@
 
 from .has_node_params import HasNodeParams
 from .launch_config_as_bool import LaunchConfigAsBool
+from .launch_utils import (append_env_path, launch_config_as_bool, load_robot_description,
+                           process_xacro, SafeDumper, SafeLoader)
+from .namespaced_params import namespaced_params_file
 from .replace_string import ReplaceString
 from .rewritten_yaml import RewrittenYaml
 
 __all__ = [
+    'append_env_path',
     'HasNodeParams',
     'LaunchConfigAsBool',
+    'launch_config_as_bool',
+    'load_robot_description',
+    'namespaced_params_file',
+    'process_xacro',
     'RewrittenYaml',
     'ReplaceString',
+    'SafeDumper',
+    'SafeLoader',
 ]
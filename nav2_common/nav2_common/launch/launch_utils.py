@@ -0,0 +1,97 @@
+# Copyright (c) 2026 Open Navigation LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from functools import lru_cache
+import hashlib
+import os
+import threading
+from typing import Optional
+
+from launch import Action, LaunchContext
+from launch.actions import SetEnvironmentVariable
+
+from .launch_config_as_bool import LaunchConfigAsBool
+
+try:
+    # The libyaml based implementations are an order of magnitude faster on large files
+    from yaml import CSafeDumper as SafeDumper
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeDumper, SafeLoader  # type: ignore[assignment]
+
+__all__ = [
+    'append_env_path',
+    'launch_config_as_bool',
+    'load_robot_description',
+    'process_xacro',
+    'SafeDumper',
+    'SafeLoader',
+]
+
+# xacro keeps its processing state in module globals, so all expansions within the
+# process must be serialized, whichever launch file requests them
+_xacro_lock = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def process_xacro(path: str, mappings: frozenset[tuple[str, str]] = frozenset()) -> str:
+    """Expand a xacro file in-process, reusing the result of repeated expansions."""
+    import xacro
+
+    with _xacro_lock:
+        return str(xacro.process_file(path, mappings=dict(mappings)).toprettyxml(indent='  '))
+
+
+def load_robot_description(xacro_file: str, prebuilt_urdf: Optional[str] = None) -> str:
+    """
+    Load the URDF prebuilt from xacro_file if it is up to date, else expand xacro_file.
+
+    The prebuilt URDF is up to date while every xacro file it was expanded from still
+    matches the SHA-256 recorded for it in the <prebuilt_urdf>.sha256 stamp, which is
+    written at build time in the format of sha256sum.
+    """
+    if (prebuilt_urdf is not None and os.path.isfile(prebuilt_urdf)
+            and _matches_stamp(prebuilt_urdf + '.sha256', xacro_file)):
+        with open(prebuilt_urdf, 'r', buffering=1 << 16) as f:
+            return f.read()
+    return process_xacro(xacro_file)
+
+
+def _matches_stamp(stamp: str, xacro_file: str) -> bool:
+    try:
+        with open(stamp, 'r') as f:
+            recorded = [line.split('  ', 1) for line in f.read().splitlines() if line]
+        if os.path.realpath(xacro_file) not in {os.path.realpath(path) for _, path in recorded}:
+            return False
+        for digest, path in recorded:
+            with open(path, 'rb') as source:
+                if hashlib.sha256(source.read()).hexdigest() != digest:
+                    return False
+    except (OSError, ValueError):
+        return False
+    return True
+
+
+def append_env_path(name: str, path: str, context: LaunchContext) -> list[Action]:
+    """Append a path to a path list environment variable, unless it is already listed."""
+    current = context.environment.get(name, '')
+    if path in current.split(os.pathsep):
+        return []
+    return [SetEnvironmentVariable(name, os.pathsep.join((current, path)) if current else path)]
+
+
+@lru_cache(maxsize=None)
+def launch_config_as_bool(name: str) -> LaunchConfigAsBool:
+    """Return the LaunchConfigAsBool of a launch configuration, shared across uses."""
+    return LaunchConfigAsBool(name)
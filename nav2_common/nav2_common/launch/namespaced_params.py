@@ -0,0 +1,111 @@
+# Copyright (c) 2026 Open Navigation LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from contextlib import suppress
+import glob
+import hashlib
+import os
+import tempfile
+from typing import Any, IO, Optional
+
+import yaml
+
+from .launch_utils import SafeDumper, SafeLoader
+
+# Parsed params files, keyed by the digest of their contents
+_parsed_params: dict[str, Any] = {}
+
+
+def namespaced_params_file(source_file: str, root_key: str) -> str:
+    """
+    Return a params file holding the params of source_file under root_key.
+
+    The file matches the one RewrittenYaml writes for the same root_key. It is cached
+    under $XDG_CACHE_HOME/nav2_common/params, keyed by root_key and the contents of
+    source_file, and replaces the cached file of any earlier contents for root_key.
+    Without a usable cache directory, an uncached temporary file is written instead.
+    """
+    if not root_key:
+        # Without a root key, the namespaced params would match the source file
+        return source_file
+
+    # The file is read once, and the same bytes are used for the cache key and the parse
+    with open(source_file, 'rb') as source:
+        data = source.read()
+    content_digest = hashlib.sha256(data).hexdigest()
+    key_digest = hashlib.sha256(root_key.encode()).hexdigest()
+
+    cache_dir = _cache_dir()
+    if cache_dir is not None:
+        cache_path = os.path.join(cache_dir, f'{key_digest}-{content_digest}.yaml')
+        if os.path.isfile(cache_path):
+            return cache_path
+
+    # Parse each distinct params file only once and share it between root keys
+    params = _parsed_params.get(content_digest)
+    if params is None:
+        params = _parsed_params[content_digest] = yaml.load(data, Loader=SafeLoader)
+    namespaced_params = {root_key: params}
+
+    if cache_dir is not None:
+        try:
+            # Stage through a temporary file in the cache directory so the replace is atomic
+            os.makedirs(cache_dir, exist_ok=True)
+            staged = tempfile.NamedTemporaryFile(
+                mode='w', dir=cache_dir, suffix='.yaml', delete=False)
+        except OSError:
+            pass
+        else:
+            staged_path = _write_params_file(namespaced_params, staged)
+            try:
+                os.replace(staged_path, cache_path)
+            except OSError:
+                # The staged file holds the same params, it is only left out of the cache
+                return staged_path
+            _prune(os.path.join(cache_dir, f'{key_digest}-*.yaml'), cache_path)
+            return cache_path
+
+    # Without a writable cache directory, the params are written to an uncached file
+    return _write_params_file(
+        namespaced_params, tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False))
+
+
+def _cache_dir() -> Optional[str]:
+    # An empty or relative XDG_CACHE_HOME is ignored, as per the XDG base directory spec
+    cache_home = os.environ.get('XDG_CACHE_HOME', '')
+    if not os.path.isabs(cache_home):
+        cache_home = os.path.expanduser(os.path.join('~', '.cache'))
+    if not os.path.isabs(cache_home):
+        # The home directory could not be resolved
+        return None
+    return os.path.join(cache_home, 'nav2_common', 'params')
+
+
+def _write_params_file(params: dict[str, Any], staged: IO[str]) -> str:
+    """Dump the params into the staged file, removing the file if that fails."""
+    try:
+        with staged:
+            yaml.dump(params, staged, Dumper=SafeDumper)
+    except BaseException:
+        os.unlink(staged.name)
+        raise
+    return staged.name
+
+
+def _prune(pattern: str, keep: str) -> None:
+    """Remove the cached files matching pattern, other than keep."""
+    for path in glob.glob(pattern):
+        if path != keep:
+            with suppress(OSError):
+                os.unlink(path)
@@ -19,6 +19,8 @@ from typing import Optional, TypeAlias, Union
 import launch
 import yaml
 
+from .launch_utils import SafeDumper, SafeLoader
+
 YamlValue: TypeAlias = Union[str, int, float, bool]
 
 
@@ -105,7 +107,7 @@ class RewrittenYaml(launch.Substitution):
         param_rewrites, keys_rewrites, value_rewrites = self.resolve_rewrites(context)
 
         with open(yaml_filename, 'r') as yaml_file:
-            data = yaml.safe_load(yaml_file)
+            data = yaml.load(yaml_file, Loader=SafeLoader)
 
         self.substitute_params(data, param_rewrites)
         self.add_params(data, param_rewrites)
@@ -115,7 +117,7 @@ class RewrittenYaml(launch.Substitution):
             root_key = launch.utilities.perform_substitutions(context, self.__root_key)
             if root_key:
                 data = {root_key: data}
-        yaml.dump(data, rewritten_yaml)
+        yaml.dump(data, rewritten_yaml, Dumper=SafeDumper)
         rewritten_yaml.close()
         return rewritten_yaml.name
 
@@ -0,0 +1,129 @@
+# Copyright (c) 2026 Open Navigation LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hashlib
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from launch import LaunchContext
+from launch.actions import SetEnvironmentVariable
+from launch.utilities import perform_substitutions
+from nav2_common.launch import append_env_path, launch_config_as_bool, load_robot_description
+
+
+class TestLoadRobotDescription(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.xacro_file = os.path.join(self.tmp_dir.name, 'robot.urdf.xacro')
+        self.include_file = os.path.join(self.tmp_dir.name, 'wheel.urdf.xacro')
+        self.urdf_file = os.path.join(self.tmp_dir.name, 'robot.urdf')
+        self.write(self.xacro_file, '<robot name="xacro"/>')
+        self.write(self.include_file, '<link name="wheel"/>')
+        self.write(self.urdf_file, '<robot name="prebuilt"/>')
+        self.write_stamp(self.xacro_file, self.include_file)
+        patcher = mock.patch('nav2_common.launch.launch_utils.process_xacro',
+                             return_value='<robot name="expanded"/>')
+        self.process_xacro = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def write(self, path: str, content: str) -> None:
+        with open(path, 'w') as f:
+            f.write(content)
+
+    def write_stamp(self, *paths: str) -> None:
+        lines = []
+        for path in paths:
+            with open(path, 'rb') as f:
+                lines.append(f'{hashlib.sha256(f.read()).hexdigest()}  {path}\n')
+        self.write(self.urdf_file + '.sha256', ''.join(lines))
+
+    def test_uses_up_to_date_prebuilt_urdf(self) -> None:
+        self.assertEqual(
+            load_robot_description(self.xacro_file, self.urdf_file), '<robot name="prebuilt"/>')
+        self.process_xacro.assert_not_called()
+
+    def test_expands_when_an_included_file_changed(self) -> None:
+        self.write(self.include_file, '<link name="caster"/>')
+        self.assertEqual(
+            load_robot_description(self.xacro_file, self.urdf_file), '<robot name="expanded"/>')
+        self.process_xacro.assert_called_once_with(self.xacro_file)
+
+    def test_expands_when_an_included_file_is_missing(self) -> None:
+        os.remove(self.include_file)
+        self.assertEqual(
+            load_robot_description(self.xacro_file, self.urdf_file), '<robot name="expanded"/>')
+
+    def test_expands_when_stamp_is_for_another_xacro(self) -> None:
+        self.write_stamp(self.include_file)
+        self.assertEqual(
+            load_robot_description(self.xacro_file, self.urdf_file), '<robot name="expanded"/>')
+
+    def test_expands_when_stamp_is_malformed(self) -> None:
+        self.write(self.urdf_file + '.sha256', 'not a stamp\n')
+        self.assertEqual(
+            load_robot_description(self.xacro_file, self.urdf_file), '<robot name="expanded"/>')
+
+    def test_expands_without_stamp(self) -> None:
+        os.remove(self.urdf_file + '.sha256')
+        self.assertEqual(
+            load_robot_description(self.xacro_file, self.urdf_file), '<robot name="expanded"/>')
+
+    def test_expands_without_prebuilt_urdf(self) -> None:
+        os.remove(self.urdf_file)
+        self.assertEqual(
+            load_robot_description(self.xacro_file, self.urdf_file), '<robot name="expanded"/>')
+        self.assertEqual(load_robot_description(self.xacro_file), '<robot name="expanded"/>')
+
+
+class TestAppendEnvPath(unittest.TestCase):
+
+    def append(self, environment: dict[str, str], path: str) -> list[tuple[str, str]]:
+        context = LaunchContext()
+        with mock.patch.dict(os.environ, environment, clear=True):
+            actions = append_env_path('GZ_SIM_RESOURCE_PATH', path, context)
+        values = []
+        for action in actions:
+            assert isinstance(action, SetEnvironmentVariable)
+            values.append((perform_substitutions(context, action.name),
+                           perform_substitutions(context, action.value)))
+        return values
+
+    def test_present_path_is_not_appended(self) -> None:
+        value = os.pathsep.join(['/a', '/worlds', '', '/a'])
+        self.assertEqual(self.append({'GZ_SIM_RESOURCE_PATH': value}, '/worlds'), [])
+
+    def test_absent_path_is_appended_to_the_value_untouched(self) -> None:
+        value = os.pathsep.join(['/a', '', '/a'])
+        self.assertEqual(
+            self.append({'GZ_SIM_RESOURCE_PATH': value}, '/worlds'),
+            [('GZ_SIM_RESOURCE_PATH', value + os.pathsep + '/worlds')])
+
+    def test_empty_variable_is_set_to_path(self) -> None:
+        self.assertEqual(
+            self.append({'GZ_SIM_RESOURCE_PATH': ''}, '/worlds'),
+            [('GZ_SIM_RESOURCE_PATH', '/worlds')])
+        self.assertEqual(self.append({}, '/worlds'), [('GZ_SIM_RESOURCE_PATH', '/worlds')])
+
+
+class TestLaunchConfigAsBool(unittest.TestCase):
+
+    def test_instances_are_shared(self) -> None:
+        self.assertIs(launch_config_as_bool('use_rviz'), launch_config_as_bool('use_rviz'))
+        self.assertIsNot(launch_config_as_bool('use_rviz'), launch_config_as_bool('autostart'))
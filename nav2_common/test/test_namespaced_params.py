@@ -0,0 +1,112 @@
+# Copyright (c) 2026 Open Navigation LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from launch import LaunchContext
+from nav2_common.launch import namespaced_params, namespaced_params_file, RewrittenYaml
+
+
+class TestNamespacedParamsFile(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.cache_home = os.path.join(self.tmp_dir.name, 'cache')
+        self.cache_dir = os.path.join(self.cache_home, 'nav2_common', 'params')
+        self.source_file = os.path.join(self.tmp_dir.name, 'params.yaml')
+        self.write_source('controller_server:\n  ros__parameters:\n    frequency: 20.0\n')
+        env = mock.patch.dict(os.environ, {'XDG_CACHE_HOME': self.cache_home})
+        env.start()
+        self.addCleanup(env.stop)
+        namespaced_params._parsed_params.clear()
+
+    def write_source(self, content: str) -> None:
+        with open(self.source_file, 'w') as f:
+            f.write(content)
+
+    def read(self, path: str) -> str:
+        with open(path, 'r') as f:
+            return f.read()
+
+    def cached_files(self) -> list[str]:
+        return sorted(os.listdir(self.cache_dir))
+
+    def rewritten_yaml(self, root_key: str) -> str:
+        path = RewrittenYaml(source_file=self.source_file, root_key=root_key,
+                             param_rewrites={}).perform(LaunchContext())
+        self.addCleanup(os.unlink, path)
+        return self.read(path)
+
+    def test_empty_root_key_returns_source_file(self) -> None:
+        self.assertEqual(namespaced_params_file(self.source_file, ''), self.source_file)
+        self.assertFalse(os.path.exists(self.cache_home))
+
+    def test_cache_miss_matches_rewritten_yaml(self) -> None:
+        path = namespaced_params_file(self.source_file, 'robot1')
+        self.assertEqual(os.path.dirname(path), self.cache_dir)
+        self.assertEqual(self.read(path), self.rewritten_yaml('robot1'))
+        self.assertEqual(self.cached_files(), [os.path.basename(path)])
+
+    def test_cache_hit_skips_parsing(self) -> None:
+        path = namespaced_params_file(self.source_file, 'robot1')
+        namespaced_params._parsed_params.clear()
+        with mock.patch('nav2_common.launch.namespaced_params.yaml.load') as load:
+            self.assertEqual(namespaced_params_file(self.source_file, 'robot1'), path)
+        load.assert_not_called()
+
+    def test_new_contents_prune_previous_entry_of_same_root_key(self) -> None:
+        old_path = namespaced_params_file(self.source_file, 'robot1')
+        other_path = namespaced_params_file(self.source_file, 'robot2')
+        self.write_source('controller_server:\n  ros__parameters:\n    frequency: 10.0\n')
+        new_path = namespaced_params_file(self.source_file, 'robot1')
+        self.assertNotEqual(new_path, old_path)
+        self.assertFalse(os.path.exists(old_path))
+        self.assertEqual(self.read(new_path), self.rewritten_yaml('robot1'))
+        self.assertEqual(
+            self.cached_files(), sorted(os.path.basename(p) for p in (new_path, other_path)))
+
+    def test_empty_xdg_cache_home_uses_home_cache(self) -> None:
+        home = os.path.join(self.tmp_dir.name, 'home')
+        with mock.patch.dict(os.environ, {'XDG_CACHE_HOME': '', 'HOME': home}):
+            path = namespaced_params_file(self.source_file, 'robot1')
+        self.assertEqual(
+            os.path.dirname(path), os.path.join(home, '.cache', 'nav2_common', 'params'))
+
+    def test_unwritable_cache_dir_falls_back_to_uncached_file(self) -> None:
+        # A file in place of the cache directory makes it unusable, even for root
+        with open(self.cache_home, 'w'):
+            pass
+        path = namespaced_params_file(self.source_file, 'robot1')
+        self.addCleanup(os.unlink, path)
+        self.assertEqual(os.path.dirname(path), tempfile.gettempdir())
+        self.assertEqual(self.read(path), self.rewritten_yaml('robot1'))
+
+    def test_failed_replace_returns_staged_file(self) -> None:
+        with mock.patch('nav2_common.launch.namespaced_params.os.replace',
+                        side_effect=PermissionError):
+            path = namespaced_params_file(self.source_file, 'robot1')
+        self.assertEqual(os.path.dirname(path), self.cache_dir)
+        self.assertEqual(self.read(path), self.rewritten_yaml('robot1'))
+        self.assertEqual(self.cached_files(), [os.path.basename(path)])
+
+    def test_failed_dump_removes_staged_file(self) -> None:
+        with mock.patch('nav2_common.launch.namespaced_params.yaml.dump',
+                        side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                namespaced_params_file(self.source_file, 'robot1')
+        self.assertEqual(self.cached_files(), [])